@@ -1,106 +1,58 @@
 """
 Database Connection Middleware
 
-This middleware ensures proper database connection management by:
-1. Closing idle connections before each request
-2. Ensuring connections are closed after each response
-3. Handling connection errors gracefully
-4. Preventing connection timeout issues
-5. Retrying failed connections
+Translates persistent database connection failures into a friendly 503
+response. Connection lifecycle and recovery are owned by the psycopg3
+connection pool configured in settings: the pool's `check` hook plus
+CONN_HEALTH_CHECKS validate each connection before a view sees it, so
+there is no sleep-based retry loop holding a worker hostage here.
 """
 
 import logging
-import time
-from django.db import connections, close_old_connections, OperationalError
-from django.core.exceptions import MiddlewareNotUsed
+import re
+from django.db import OperationalError
 from django.http import JsonResponse
 
 logger = logging.getLogger(__name__)
 
+# Hoisted to module level so the hot path does not rebuild these per request
+_ERR_PAYLOAD = {
+    'error': 'Database temporarily unavailable',
+    'message': 'Please try again in a moment',
+    'details': 'Connection timeout - database may be slow to respond',
+}
+
+# Requests that never touch the ORM (uptime pings, static assets, CORS
+# preflights) skip the error handling entirely
+_SKIP_PREFIXES = ('/api/ping/', '/static/', '/media/', '/favicon')
+
+# Connection-level errors become a 503 - precompiled so classification is a single scan
+_CONNECTION_ERR_RE = re.compile(r'connection timeout|could not connect', re.I)
+
 
 class DatabaseConnectionMiddleware:
     """
-    Middleware to manage database connections properly.
-    
-    This prevents connection timeout errors by:
-    - Closing old/stale connections before processing requests
-    - Properly closing connections after responses
-    - Handling connection pool exhaustion
+    Middleware to surface database connection failures as a 503.
+
+    The connection pool serves warm, validated connections, so by the
+    time an OperationalError reaches this middleware the database is
+    genuinely unreachable - retrying in-process would only block the
+    worker. Return the 503 immediately and let the client retry.
     """
-    
+
     def __init__(self, get_response):
         self.get_response = get_response
-        
+
     def __call__(self, request):
-        # Close any old connections before processing the request
-        # This ensures we don't use stale or timed-out connections
-        close_old_connections()
-        
-        # Retry logic for database connection issues
-        max_retries = 3
-        retry_delay = 1  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                # Process the request
-                response = self.get_response(request)
-                
-                # Ensure all connections are properly returned to the pool
-                self._cleanup_connections()
-                
-                return response
-                
-            except OperationalError as e:
-                # Database connection error
-                error_msg = str(e).lower()
-                
-                if 'connection timeout' in error_msg or 'could not connect' in error_msg:
-                    logger.warning(f"Database connection attempt {attempt + 1}/{max_retries} failed: {e}")
-                    
-                    if attempt < max_retries - 1:
-                        # Retry after delay
-                        time.sleep(retry_delay)
-                        close_old_connections()  # Close failed connection
-                        continue
-                    else:
-                        # Final attempt failed
-                        logger.error(f"Database connection failed after {max_retries} attempts: {e}")
-                        self._cleanup_connections()
-                        
-                        # Return user-friendly error
-                        return JsonResponse({
-                            'error': 'Database temporarily unavailable',
-                            'message': 'Please try again in a moment',
-                            'details': 'Connection timeout - database may be slow to respond'
-                        }, status=503)
-                else:
-                    # Other database error, don't retry
-                    raise
-                    
-            except Exception as e:
-                # On any other error, ensure connections are cleaned up
-                logger.error(f"Error during request processing: {e}")
-                self._cleanup_connections()
-                raise
-        
-        # Should never reach here
-        self._cleanup_connections()
-        return JsonResponse({'error': 'Unexpected error'}, status=500)
-    
-    def _cleanup_connections(self):
-        """
-        Clean up database connections.
-        For transaction poolers (conn_max_age=0), this closes connections.
-        For session poolers (conn_max_age>0), this returns connections to pool.
-        """
+        # Fast path for requests that never hit the database
+        if request.method == 'OPTIONS' or request.path.startswith(_SKIP_PREFIXES):
+            return self.get_response(request)
+
         try:
-            # Close old connections that have exceeded their max age
-            close_old_connections()
-            
-            # For transaction pooler mode (conn_max_age=0), force close all connections
-            for conn in connections.all():
-                if hasattr(conn, 'close_if_unusable_or_obsolete'):
-                    conn.close_if_unusable_or_obsolete()
-                    
-        except Exception as e:
-            logger.warning(f"Error cleaning up database connections: {e}")
+            return self.get_response(request)
+        except OperationalError as e:
+            if _CONNECTION_ERR_RE.search(str(e)):
+                logger.error(f"Database connection failed: {e}")
+                return JsonResponse(_ERR_PAYLOAD, status=503)
+            # Other database error - let it propagate
+            raise
@@ -83,6 +83,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Trigram search lookups (admin product search)
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -221,18 +222,24 @@ if os.environ.get('DATABASE_URL'):
         }
         DATABASES['default']['OPTIONS'] = {
             'connect_timeout': 60,  # Increased to 60 seconds for network issues
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 3,
+            'tcp_user_timeout': 15000,  # Fail dead connections in ~15s instead of ~2min
             'options': '-c statement_timeout=30000 -c idle_in_transaction_session_timeout=30000',
         }
         # Disable server-side cursors for transaction pooler compatibility
         DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
     else:
         # Session Pooler Configuration (port 5432) - RECOMMENDED for Render
-        # Supports persistent connections - better for long-running servers
+        # Uses Django 5.1+ native psycopg3 connection pooling - connections are
+        # opened once and reused, so requests skip the TCP+TLS+auth handshake
         DATABASES = {
             'default': dj_database_url.config(
                 default=database_url,
-                conn_max_age=600,  # 10 minutes - increased for stability
-                conn_health_checks=True,  # Check connection health before reuse
+                conn_max_age=0,  # Must be 0 when using the psycopg pool - the pool owns connection lifetime
+                conn_health_checks=True,  # Validate pooled connections before handing them to views
             )
         }
         DATABASES['default']['OPTIONS'] = {
@@ -243,6 +250,15 @@ if os.environ.get('DATABASE_URL'):
             'keepalives_count': 5,
             'tcp_user_timeout': 30000,  # 30 seconds TCP timeout
             'options': '-c statement_timeout=300000 -c idle_in_transaction_session_timeout=60000',
+            'pool': {
+                'min_size': 2,
+                'max_size': int(os.environ.get('DB_POOL_MAX', '4')),
+                'timeout': 10,  # Seconds to wait for a free connection
+                'max_lifetime': 1800,  # Recycle connections after 30 minutes
+                # No 'check' here: conn_health_checks=True above is how Django
+                # wires ConnectionPool.check_connection in; passing it again
+                # raises "multiple values for keyword argument 'check'"
+            },
         }
         # Enable connection pooling optimization
         DATABASES['default']['ATOMIC_REQUESTS'] = False  # Don't wrap every view in transaction
@@ -325,14 +341,10 @@ PASSWORD_HASHERS = [
 # DATABASE CONNECTION POOL SETTINGS
 # ========================================
 
-# Close database connections after each request if using transaction pooler
-# This is handled by the DatabaseConnectionMiddleware
-if os.environ.get('DATABASE_URL') and ':6543/' in os.environ.get('DATABASE_URL', ''):
-    # Transaction pooler - connections must be closed after each request
-    CONN_MAX_AGE = 0
-else:
-    # Session pooler - keep connections alive
-    CONN_MAX_AGE = 600  # 10 minutes
+# CONN_MAX_AGE stays 0 in both modes:
+# - Transaction pooler: connections must be closed after each request
+# - Session pooler: the psycopg3 pool owns connection lifetime (see DATABASES OPTIONS)
+CONN_MAX_AGE = 0
 
 
 # ========================================
@@ -7,8 +7,57 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
 backlog = 2048
 
 # Worker Processes
-workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'sync'
+# The workload is I/O-bound (outbound scraping HTTP + database roundtrips),
+# so threaded workers keep serving other requests while one thread waits.
+# Fewer processes x more threads also shrinks the DB connection footprint.
+
+def _cgroup_cpu_count():
+    """Effective CPU count from the container's cgroup quota.
+
+    On Render's small instances os.cpu_count() reports the host's cores,
+    which would spawn far more workers than the CPU quota can run.
+    """
+    try:
+        # cgroup v2: "max 100000" or "50000 100000" (quota period)
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return multiprocessing.cpu_count()
+
+
+def _cgroup_memory_limit():
+    """Container memory limit in bytes, or None if unlimited/unknown."""
+    try:
+        with open('/sys/fs/cgroup/memory.max') as f:
+            raw = f.read().strip()
+        if raw != 'max':
+            return int(raw)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+_WORKER_RSS_ESTIMATE = 200 * 1024 * 1024  # ~200MB per Django worker
+
+_env_workers = os.environ.get('GUNICORN_WORKERS')
+if _env_workers:
+    # An explicit operator setting passes through untouched
+    workers = int(_env_workers)
+else:
+    # Default: one worker per effective CPU, at least 2 so a slow request
+    # can't monopolize the service - but never more than memory allows,
+    # so the clamp is applied last. OOM kills manifest as the "connection
+    # timeout" errors the DB middleware then has to absorb.
+    workers = max(2, _cgroup_cpu_count())
+    _mem_limit = _cgroup_memory_limit()
+    if _mem_limit:
+        workers = min(workers, max(1, _mem_limit // _WORKER_RSS_ESTIMATE))
+
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
 worker_connections = 1000
 max_requests = 1000  # Restart workers after this many requests to prevent memory leaks
 max_requests_jitter = 50  # Add randomness to prevent all workers restarting at once
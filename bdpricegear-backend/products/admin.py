@@ -1,7 +1,30 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import Category, Shop, Product, PriceHistory, Wishlist
 from .models import Category, Shop, Product, PriceHistory, Wishlist, StockSubscription
 
+# Frozen once at import so changeform renders reuse the same structure
+_PRODUCT_FIELDSETS = (
+    ('Basic Information', {
+        'fields': ('name', 'slug', 'category', 'shop')
+    }),
+    ('Product Details', {
+        'fields': ('description', 'image_url', 'product_url')
+    }),
+    ('Pricing', {
+        'fields': ('current_price', 'currency')
+    }),
+    ('Availability', {
+        'fields': ('stock_status', 'is_available')
+    }),
+    ('Metadata', {
+        'fields': ('views_count', 'last_scraped', 'created_at', 'updated_at'),
+        'classes': ('collapse',)
+    }),
+)
+
+_PRICE_HISTORY_READONLY_FIELDS = ('product', 'price', 'stock_status', 'recorded_at')
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -9,10 +32,15 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
-    
+
+    def get_queryset(self, request):
+        # Annotate the count once instead of one COUNT(*) per row
+        return super().get_queryset(request).annotate(_product_count=Count('products'))
+
     def product_count(self, obj):
-        return obj.products.count()
+        return obj._product_count
     product_count.short_description = 'Products'
+    product_count.admin_order_field = '_product_count'
 
 
 @admin.register(Shop)
@@ -22,38 +50,29 @@ class ShopAdmin(admin.ModelAdmin):
     search_fields = ['name', 'website_url']
     prepopulated_fields = {'slug': ('name',)}
     list_editable = ['is_active', 'scraping_enabled', 'priority']
-    
+
+    def get_queryset(self, request):
+        # Annotate the count once instead of one COUNT(*) per row
+        return super().get_queryset(request).annotate(_product_count=Count('products'))
+
     def product_count(self, obj):
-        return obj.products.count()
+        return obj._product_count
     product_count.short_description = 'Products'
+    product_count.admin_order_field = '_product_count'
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ['name', 'shop', 'category', 'current_price', 'stock_status', 'is_available', 'last_scraped']
     list_filter = ['shop', 'category', 'stock_status', 'is_available', 'created_at']
+    # The default ILIKE '%term%' search is served by the pg_trgm GIN index
+    # from migration 0004 on PostgreSQL - no custom lookup needed
     search_fields = ['name']
+    list_select_related = ('shop', 'category')  # One JOIN instead of 2 queries per row
     readonly_fields = ['slug', 'views_count', 'last_scraped', 'created_at', 'updated_at']
     list_per_page = 50
-    
-    fieldsets = (
-        ('Basic Information', {
-            'fields': ('name', 'slug', 'category', 'shop')
-        }),
-        ('Product Details', {
-            'fields': ('description', 'image_url', 'product_url')
-        }),
-        ('Pricing', {
-            'fields': ('current_price', 'currency')
-        }),
-        ('Availability', {
-            'fields': ('stock_status', 'is_available')
-        }),
-        ('Metadata', {
-            'fields': ('views_count', 'last_scraped', 'created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
+
+    fieldsets = _PRODUCT_FIELDSETS
 
 
 @admin.register(PriceHistory)
@@ -61,9 +80,11 @@ class PriceHistoryAdmin(admin.ModelAdmin):
     list_display = ['product', 'price', 'stock_status', 'recorded_at']
     list_filter = ['stock_status', 'recorded_at']
     search_fields = ['product__name']
-    readonly_fields = ['product', 'price', 'stock_status', 'recorded_at']
+    list_select_related = ('product',)  # One JOIN instead of a query per row
+    readonly_fields = _PRICE_HISTORY_READONLY_FIELDS
     date_hierarchy = 'recorded_at'
     list_per_page = 100
+    show_full_result_count = False  # Skip the extra COUNT(*) over the whole table per page
     
     def has_add_permission(self, request):
         return False  # Don't allow manual addition
@@ -1,4 +1,5 @@
 import django_filters
+from django.db import connection
 from .models import Product, Category, Shop
 
 
@@ -29,9 +30,56 @@ class ProductFilter(django_filters.FilterSet):
     class Meta:
         model = Product
         fields = ['category', 'shop', 'stock_status', 'is_available']
-    
+
+    # Lookup for each simple filter, applied together in filter_queryset
+    _SIMPLE_LOOKUPS = {
+        'category': 'category__slug__iexact',
+        'category_name': 'category__name__icontains',
+        'shop': 'shop__slug__iexact',
+        'shop_name': 'shop__name__icontains',
+        'min_price': 'current_price__gte',
+        'max_price': 'current_price__lte',
+        'stock_status': 'stock_status__iexact',
+        'is_available': 'is_available',
+    }
+
+    def filter_queryset(self, queryset):
+        # Collect every active predicate and apply them in one .filter() call
+        # so the ORM plans a single WHERE pass instead of chaining a queryset
+        # clone per filter; search runs last since it annotates/ranks
+        data = self.form.cleaned_data
+        predicates = models.Q()
+
+        for field, lookup in self._SIMPLE_LOOKUPS.items():
+            value = data.get(field)
+            if value is not None and value != '':
+                predicates &= models.Q(**{lookup: value})
+
+        if data.get('in_stock'):
+            predicates &= models.Q(stock_status='in_stock', is_available=True)
+        if data.get('on_sale'):
+            predicates &= models.Q(stock_status='in_stock', is_available=True, current_price__gt=0)
+
+        if predicates:
+            queryset = queryset.filter(predicates)
+
+        if data.get('search'):
+            queryset = self.filter_search(queryset, 'search', data['search'])
+        return queryset
+
+
     def filter_search(self, queryset, name, value):
         # Search in product name and description
+        if connection.vendor == 'postgresql':
+            # Full-text search over the GIN-indexed tsvector (migration 0006)
+            # instead of two per-row ILIKE '%...%' scans. No SearchRank here:
+            # the viewset's OrderingFilter applies its own ordering afterwards,
+            # so a per-row rank would be computed and then discarded
+            from django.contrib.postgres.search import SearchQuery, SearchVector
+            vector = SearchVector('name', weight='A', config='english') + \
+                SearchVector('description', weight='B', config='english')
+            query = SearchQuery(value, config='english')
+            return queryset.annotate(search=vector).filter(search=query)
         return queryset.filter(
             models.Q(name__icontains=value) |
             models.Q(description__icontains=value)
@@ -44,9 +92,10 @@ class ProductFilter(django_filters.FilterSet):
         return queryset
     
     def filter_on_sale(self, queryset, name, value):
-        # Filter products with discounts
+        # Filter products that are purchasable right now (the model tracks no
+        # discount column, so "on sale" means in stock with a real price)
         if value:
-            return queryset.filter(discount_percentage__gt=0)
+            return queryset.filter(stock_status='in_stock', is_available=True, current_price__gt=0)
         return queryset
 
 
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from products.models import Product, Category, Shop
+
+
+class Command(BaseCommand):
+    help = 'Show product counts broken down by category and shop'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('\n=== Product Statistics ===\n'))
+
+        # One aggregate for all the global numbers instead of a count() per metric
+        totals = Product.objects.aggregate(
+            total=Count('id'),
+            available=Count('id', filter=Q(is_available=True)),
+            uncategorized=Count('id', filter=Q(category__isnull=True)),
+            uncategorized_available=Count('id', filter=Q(category__isnull=True, is_available=True)),
+        )
+
+        self.stdout.write(f'Total products: {totals["total"]:,}')
+        self.stdout.write(f'Available products: {totals["available"]:,}')
+        self.stdout.write(f'Uncategorized products: {totals["uncategorized"]:,} '
+                          f'({totals["uncategorized_available"]:,} available)')
+
+        # One GROUP BY per breakdown instead of two count() queries per row
+        by_category = {
+            row['category_id']: row
+            for row in Product.objects.values('category_id').annotate(
+                total=Count('id'),
+                available=Count('id', filter=Q(is_available=True)),
+            )
+        }
+        by_shop = {
+            row['shop_id']: row
+            for row in Product.objects.values('shop_id').annotate(
+                total=Count('id'),
+                available=Count('id', filter=Q(is_available=True)),
+            )
+        }
+
+        self.stdout.write(self.style.WARNING('\n=== Products by Category ==='))
+        category_sum = 0
+        for category in Category.objects.order_by('name'):
+            row = by_category.get(category.id)
+            total = row['total'] if row else 0
+            available = row['available'] if row else 0
+            category_sum += total
+            self.stdout.write(f'  {category.name}: {total:,} ({available:,} available)')
+
+        self.stdout.write(f'  Sum across categories: {category_sum:,}')
+
+        self.stdout.write(self.style.WARNING('\n=== Products by Shop ==='))
+        for shop in Shop.objects.order_by('-priority', 'name'):
+            row = by_shop.get(shop.id)
+            total = row['total'] if row else 0
+            available = row['available'] if row else 0
+            self.stdout.write(f'  {shop.name}: {total:,} ({available:,} available)')
+
+        self.stdout.write('')
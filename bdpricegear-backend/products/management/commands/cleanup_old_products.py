@@ -1,8 +1,9 @@
 
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
-from products.models import Product, PriceHistory
+from products.models import Product, PriceHistory, Wishlist, StockSubscription
 
 
 class Command(BaseCommand):
@@ -31,14 +32,18 @@ class Command(BaseCommand):
         self.stdout.write(f'   Cutoff date: {cutoff_date.strftime("%Y-%m-%d %H:%M:%S")}')
         self.stdout.write(f'   Will delete products not updated in {months} months\n')
         
-        old_products = Product.objects.filter(updated_at__lt=cutoff_date)
-        products_count = old_products.count()
-        
+        # Materialize the pk list once; the counts and the dry-run sample all
+        # reuse it instead of re-running the updated_at scan as a subquery
+        old_ids = list(
+            Product.objects.filter(updated_at__lt=cutoff_date).values_list('id', flat=True)
+        )
+        products_count = len(old_ids)
+
         if products_count == 0:
             self.stdout.write(self.style.SUCCESS('No old products found. Database is clean!'))
             return
-        
-        price_history_count = PriceHistory.objects.filter(product__in=old_products).count()
+
+        price_history_count = PriceHistory.objects.filter(product_id__in=old_ids).count()
         
         total_products = Product.objects.count()
         total_history = PriceHistory.objects.count()
@@ -53,7 +58,12 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be deleted'))
             self.stdout.write(f'   Run without --dry-run to actually delete {products_count:,} products\n')
             
-            sample = old_products.select_related('shop', 'category')[:10]
+            # Hit the pk index directly and pull only the columns we print
+            sample = (
+                Product.objects.filter(id__in=old_ids[:10])
+                .select_related('shop')
+                .only('name', 'updated_at', 'shop__name')
+            )
             if sample:
                 self.stdout.write('Sample products that would be deleted:')
                 for product in sample:
@@ -67,10 +77,36 @@ class Command(BaseCommand):
                 return
             
             self.stdout.write('\nDeleting old products and associated data...')
-            deleted_count, details = old_products.delete()
-            
+
+            # Delete in pk chunks with _raw_delete: bounds memory to one chunk,
+            # keeps each transaction short, and skips the ORM collector that
+            # would otherwise walk every cascade row in Python
+            using = Product.objects.db
+            chunk_size = 10000
+            deleted_count = 0
+            deleted_products = 0
+            while True:
+                ids = list(
+                    Product.objects.filter(updated_at__lt=cutoff_date)
+                    .values_list('id', flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    if connection.vendor == 'postgresql':
+                        # These rows are disposable - skip the fsync wait
+                        with connection.cursor() as cursor:
+                            cursor.execute('SET LOCAL synchronous_commit = off')
+                    # Referencing tables first so no FK points at a missing product
+                    deleted_count += StockSubscription.objects.filter(product_id__in=ids)._raw_delete(using)
+                    deleted_count += Wishlist.objects.filter(product_id__in=ids)._raw_delete(using)
+                    deleted_count += PriceHistory.objects.filter(product_id__in=ids)._raw_delete(using)
+                    deleted_count += Product.objects.filter(id__in=ids)._raw_delete(using)
+                deleted_products += len(ids)
+                self.stdout.write(f'   Deleted {deleted_products:,} / {products_count:,} products')
+
             self.stdout.write(self.style.SUCCESS(f'\nSuccessfully deleted {deleted_count:,} records'))
-            self.stdout.write(f'   Products deleted: {products_count:,}')
+            self.stdout.write(f'   Products deleted: {deleted_products:,}')
             self.stdout.write(f'   Price history deleted: {price_history_count:,}')
             self.stdout.write(f'   Remaining products: {Product.objects.count():,}')
             self.stdout.write(f'   Remaining price history: {PriceHistory.objects.count():,}')
@@ -11,6 +11,7 @@ Usage:
 """
 
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
 from products.models import PriceHistory
@@ -75,7 +76,26 @@ class Command(BaseCommand):
                 return
             
             self.stdout.write('\nDeleting old records...')
-            deleted_count, _ = old_records.delete()
+
+            # Chunked _raw_delete: short transactions, O(chunk) memory, and no
+            # ORM collector pass (nothing references PriceHistory)
+            using = PriceHistory.objects.db
+            chunk_size = 10000
+            deleted_count = 0
+            while True:
+                ids = list(
+                    PriceHistory.objects.filter(recorded_at__lt=cutoff_date)
+                    .values_list('id', flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    if connection.vendor == 'postgresql':
+                        # These rows are disposable - skip the fsync wait
+                        with connection.cursor() as cursor:
+                            cursor.execute('SET LOCAL synchronous_commit = off')
+                    deleted_count += PriceHistory.objects.filter(id__in=ids)._raw_delete(using)
+                self.stdout.write(f'   Deleted {deleted_count:,} / {count:,} records')
             
             self.stdout.write(self.style.SUCCESS(f'\nSuccessfully deleted {deleted_count:,} old price history records'))
             self.stdout.write(f'   Remaining records: {PriceHistory.objects.count():,}')
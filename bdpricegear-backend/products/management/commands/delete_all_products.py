@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from products.models import Product, PriceHistory
+from django.db import connection
+from products.models import Product, PriceHistory, Wishlist, StockSubscription
 
 
 class Command(BaseCommand):
@@ -32,9 +33,27 @@ class Command(BaseCommand):
                 return
         
         self.stdout.write('\nDeleting all products and price history...')
-        
-        # Delete all products (price history will cascade delete automatically)
-        deleted_products, details = Product.objects.all().delete()
+
+        if connection.vendor == 'postgresql':
+            # TRUNCATE is constant-time regardless of row count and skips the
+            # ORM collector, which otherwise SELECTs every pk and walks the
+            # cascade row by row in Python. CASCADE covers the referencing
+            # tables (price history, wishlists, stock subscriptions) exactly
+            # like the ORM cascade would.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'TRUNCATE TABLE products_pricehistory, products_product '
+                    'RESTART IDENTITY CASCADE'
+                )
+            deleted_products = product_count + price_history_count
+        else:
+            # _raw_delete issues one DELETE per table with no collector pass.
+            # Referencing tables go first so no FK ever points at a missing
+            # product mid-run.
+            using = Product.objects.db
+            deleted_products = 0
+            for model in (StockSubscription, Wishlist, PriceHistory, Product):
+                deleted_products += model.objects.all()._raw_delete(using)
         
         self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully deleted all data!'))
         self.stdout.write(f'  Products deleted: {product_count:,}')
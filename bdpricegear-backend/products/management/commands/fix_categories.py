@@ -0,0 +1,111 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.text import slugify
+from products.models import Product, Category
+
+# Canonical category names keyed by the stray/synonym names that manual
+# scrape runs have produced over time (same synonyms is_product_in_category
+# in populate_catalog recognizes)
+CATEGORY_SYNONYMS = {
+    'cpu': 'Processor',
+    'graphics card': 'GPU',
+    'memory': 'RAM',
+    'solid state drive': 'SSD',
+    'hard disk': 'HDD',
+    'hard drive': 'HDD',
+    'psu': 'Power Supply',
+    'pc case': 'Cabinet',
+    'casing': 'Cabinet',
+    'cooler': 'CPU Cooler',
+}
+
+
+class Command(BaseCommand):
+    help = 'Merge stray/synonym categories into their canonical names'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be merged without making changes'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        self.stdout.write(self.style.WARNING('\n=== Category Fixer ===\n'))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made\n'))
+
+        # Resolve every category once instead of a lookup per fix
+        categories = list(Category.objects.all())
+        by_lower_name = {c.name.lower(): c for c in categories}
+
+        # remap: old category id -> canonical category id (canonical exists)
+        # renames: stray categories whose canonical name doesn't exist yet
+        remap = {}
+        renames = []
+        for category in categories:
+            canonical_name = CATEGORY_SYNONYMS.get(category.name.lower())
+            if not canonical_name:
+                continue
+            canonical = by_lower_name.get(canonical_name.lower())
+            if canonical and canonical.id != category.id:
+                remap[category.id] = canonical.id
+                self.stdout.write(f'  Merge: "{category.name}" -> "{canonical.name}"')
+            else:
+                self.stdout.write(f'  Rename: "{category.name}" -> "{canonical_name}"')
+                category.name = canonical_name
+                category.slug = slugify(canonical_name)
+                renames.append(category)
+                # Register the renamed row as the canonical so any further
+                # strays with the same target (e.g. 'hard disk' and
+                # 'hard drive' both -> 'HDD') merge into it instead of
+                # queueing a second rename to the same unique name
+                by_lower_name[canonical_name.lower()] = category
+
+        if not remap and not renames:
+            self.stdout.write(self.style.SUCCESS('All categories already use canonical names!'))
+            return
+
+        affected = Product.objects.filter(category_id__in=remap).count() if remap else 0
+        self.stdout.write(f'\n{len(remap)} categories to merge ({affected:,} products to move)')
+        self.stdout.write(f'{len(renames)} categories to rename')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('\nRun without --dry-run to apply changes'))
+            return
+
+        # Slug is unique, so resolve collisions with unrelated categories in
+        # one lookup instead of a save()-and-retry per rename
+        if renames:
+            taken = set(
+                Category.objects.exclude(id__in=[c.id for c in renames])
+                .filter(slug__in=[c.slug for c in renames])
+                .values_list('slug', flat=True)
+            )
+            for category in renames:
+                if category.slug in taken:
+                    category.slug = f'{category.slug}-{category.id}'
+
+        # One UPDATE remapping every product, one DELETE for the merged
+        # categories, one batched UPDATE for renames - all atomic
+        with transaction.atomic():
+            if remap:
+                Product.objects.filter(category_id__in=remap).update(
+                    category_id=Case(
+                        *[When(category_id=old_id, then=Value(new_id))
+                          for old_id, new_id in remap.items()],
+                        output_field=IntegerField(),
+                    )
+                )
+                Category.objects.filter(id__in=remap).delete()
+            if renames:
+                Category.objects.bulk_update(renames, ['name', 'slug'], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Done! Moved {affected:,} products, '
+            f'removed {len(remap)} categories, renamed {len(renames)}'
+        ))
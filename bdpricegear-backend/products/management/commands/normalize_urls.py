@@ -1,8 +1,12 @@
+from collections import namedtuple
+
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 from products.models import Product
 from products.utils.catalog_scraper import normalize_product_url
 
+_CandidateRow = namedtuple('CandidateRow', ['id', 'shop_id', 'product_url', 'updated_at'])
+
 
 class Command(BaseCommand):
     help = 'Normalize all product URLs and remove duplicates'
@@ -10,6 +14,30 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--dry-run', action='store_true', help='Preview without making changes')
 
+    def _iter_candidate_rows(self):
+        """Stream only the rows the scan can act on (PostgreSQL).
+
+        Two rows can only normalize to the same URL if they share a shop and
+        everything before the '?', so grouping on split_part finds every
+        possible duplicate pair in C inside the server. Rows with query
+        params are included too since they may need their URL rewritten.
+        """
+        query = (
+            "SELECT id, shop_id, product_url, updated_at FROM products_product "
+            "WHERE product_url LIKE '%?%' "
+            "OR (shop_id, split_part(product_url, '?', 1)) IN ("
+            "SELECT shop_id, split_part(product_url, '?', 1) "
+            "FROM products_product GROUP BY 1, 2 HAVING COUNT(*) > 1)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _CandidateRow(*row)
+
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         
@@ -18,16 +46,30 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE\n'))
         
-        products = Product.objects.all().only('id', 'shop_id', 'product_url', 'updated_at')
-        total = products.count()
-        self.stdout.write(f'Scanning {total} products...')
-        
+        if connection.vendor == 'postgresql':
+            # Let Postgres prefilter: only rows that can possibly need work
+            # (URLs carrying query params, or members of a (shop, base-url)
+            # group with more than one row) ever reach Python, so url_map
+            # holds O(candidates) entries instead of one per product
+            rows = self._iter_candidate_rows()
+            total = None
+            self.stdout.write('Scanning candidates (grouped in SQL)...')
+        else:
+            # Lightweight namedtuples instead of full model instances - the
+            # scan only reads four columns, so skip per-row model construction
+            products = Product.objects.values_list(
+                'id', 'shop_id', 'product_url', 'updated_at', named=True
+            )
+            total = products.count()
+            rows = products.iterator(chunk_size=5000)
+            self.stdout.write(f'Scanning {total} products...')
+
         # Track: (shop_id, normalized_url) -> best product to keep
         url_map = {}
         duplicates_to_delete = []
         urls_to_normalize = []
-        
-        for i, p in enumerate(products.iterator(chunk_size=1000)):
+
+        for i, p in enumerate(rows):
             normalized = normalize_product_url(p.product_url)
             key = (p.shop_id, normalized)
             
@@ -47,7 +89,10 @@ class Command(BaseCommand):
                     urls_to_normalize.append((p.id, normalized))
             
             if (i + 1) % 5000 == 0:
-                self.stdout.write(f'  Scanned {i+1}/{total}')
+                if total is None:
+                    self.stdout.write(f'  Scanned {i+1}')
+                else:
+                    self.stdout.write(f'  Scanned {i+1}/{total}')
         
         self.stdout.write(f'\nFound {len(duplicates_to_delete)} duplicates to delete')
         self.stdout.write(f'Found {len(urls_to_normalize)} URLs to normalize')
@@ -56,15 +101,32 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('\nRun without --dry-run to apply changes'))
             return
         
-        # Delete duplicates in batches
+        # Delete duplicates
         if duplicates_to_delete:
             self.stdout.write(f'\nDeleting {len(duplicates_to_delete)} duplicates...')
-            batch_size = 500
-            deleted_total = 0
-            for i in range(0, len(duplicates_to_delete), batch_size):
-                batch = duplicates_to_delete[i:i + batch_size]
-                deleted, _ = Product.objects.filter(id__in=batch).delete()
-                deleted_total += deleted
+            if connection.vendor == 'postgresql':
+                # One DELETE per table via ANY(%s) instead of a collector pass
+                # per 500-id batch; referencing tables go first since the raw
+                # statements skip the ORM cascade
+                with transaction.atomic(), connection.cursor() as cursor:
+                    for table in ('products_stocksubscription', 'products_wishlist',
+                                  'products_pricehistory'):
+                        cursor.execute(
+                            f'DELETE FROM {table} WHERE product_id = ANY(%s)',
+                            [duplicates_to_delete],
+                        )
+                    cursor.execute(
+                        'DELETE FROM products_product WHERE id = ANY(%s)',
+                        [duplicates_to_delete],
+                    )
+                    deleted_total = cursor.rowcount
+            else:
+                batch_size = 500
+                deleted_total = 0
+                for i in range(0, len(duplicates_to_delete), batch_size):
+                    batch = duplicates_to_delete[i:i + batch_size]
+                    deleted, _ = Product.objects.filter(id__in=batch).delete()
+                    deleted_total += deleted
             self.stdout.write(f'  Deleted {deleted_total} products')
         
         # Update URLs in batches
@@ -2,7 +2,9 @@ from products.models import Product, Category, Shop, PriceHistory
 from products.utils.stock_notifications import send_back_in_stock_notifications
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db import transaction, close_old_connections
+from django.db import connection, transaction, close_old_connections
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import logging
 import urllib.parse
 import re
@@ -13,93 +15,97 @@ from products.utils.catalog_scraper import (
     scrape_ultratech_catalog, scrape_potakait_catalog,
     scrape_ryans_catalog, scrape_computervillage_catalog,
     scrape_smartbd_catalog, scrape_selltech_catalog, scrape_globalbrand_catalog,
-    normalize_product_url
+    scrape_ryans_catalog_batch, normalize_product_url
 )
 
 
-def is_product_in_category(product_name, category_name):
-    
-    name_lower = product_name.lower()
-    category_lower = category_name.lower()
-    
-    # Products that are full systems (laptops, desktops, tablets) - should be skipped
-    full_system_patterns = [
-        r'\blaptop\b', r'\bnotebook\b', r'\bmacbook\b', r'\bthinkpad\b',
-        r'\bideapad\b', r'\bvivobook\b', r'\bzenbook\b', r'\blegion\b',
-        r'\bpredator\b', r'\bnitro\b', r'\btuf gaming\b', r'\bloq\b', r'\byoga\b',
-        r'\bchromebook\b', r'\bultrabook\b', r'\bgalaxy book\b',
-        r'\balienware\b', r'\bxps\b', r'\blatitude\b', r'\bvostro\b',
-        r'\bdesktop\b', r'\ball[- ]?in[- ]?one\b', r'\bimac\b', r'\bmac mini\b',
-        r'\bthinkcentre\b', r'\boptiplex\b', r'\bideacentre\b',
-        r'\bpc build\b', r'\bbudget pc\b', r'\bgaming pc\b',
-        r'\btablet\b', r'\bipad\b', r'\bgalaxy tab\b', r'\bwalpad\b',
-        r'\bhonor pad\b', r'\bredmi pad\b', r'\blenovo tab\b', r'\btab m\d',
-    ]
-    
-    is_full_system = any(re.search(p, name_lower) for p in full_system_patterns)
-    
-    # Category-specific validation - STRICT matching
-    if category_lower in ['ram', 'memory']:
-        if is_full_system:
-            return False
-        # Must have DDR or specific RAM indicators (word boundary for "ram")
-        ram_indicators = [r'\bddr[345]\b', r'\bdimm\b', r'\bsodimm\b', r'\bmemory module\b', r'\bram kit\b', r'\bram\b']
-        return any(re.search(p, name_lower) for p in ram_indicators)
-    
-    elif category_lower in ['ssd', 'solid state drive']:
-        if is_full_system:
-            return False
-        ssd_indicators = [r'\bssd\b', r'\bnvme\b', r'\bm\.2\b', r'\bsolid state\b']
-        return any(re.search(p, name_lower) for p in ssd_indicators)
-    
-    elif category_lower in ['hdd', 'hard disk', 'hard drive']:
-        if is_full_system:
-            return False
-        hdd_indicators = [r'\bhdd\b', r'\bhard drive\b', r'\bhard disk\b', r'\b\d+\s*rpm\b']
-        return any(re.search(p, name_lower) for p in hdd_indicators)
-    
-    elif category_lower in ['processor', 'cpu']:
-        if is_full_system:
-            return False
-        if re.search(r'\bram\b', name_lower) and re.search(r'\bssd\b', name_lower):
-            return False
-        return True
-    
-    elif category_lower in ['gpu', 'graphics card']:
-        if is_full_system:
-            return False
-        gpu_indicators = [r'\bgraphics card\b', r'\bgeforce\b', r'\bradeon\b', r'\brtx\s*\d{4}\b', r'\bgtx\b', r'\bgpu\b']
-        return any(re.search(p, name_lower) for p in gpu_indicators)
-    
-    elif category_lower == 'monitor':
-        if is_full_system:
-            return False
-        return re.search(r'\bmonitor\b', name_lower) or re.search(r'\bdisplay\b', name_lower)
-    
-    elif category_lower == 'motherboard':
-        if is_full_system:
-            return False
-        return re.search(r'\bmotherboard\b', name_lower) or re.search(r'\bmainboard\b', name_lower)
-    
-    elif category_lower in ['power supply', 'psu']:
-        if is_full_system:
-            return False
-        return re.search(r'\bpower supply\b', name_lower) or re.search(r'\bpsu\b', name_lower) or re.search(r'\bsmps\b', name_lower)
-    
-    elif category_lower in ['cabinet', 'pc case', 'casing']:
-        return re.search(r'\bcase\b', name_lower) or re.search(r'\bcabinet\b', name_lower) or re.search(r'\bcasing\b', name_lower)
-    
-    elif category_lower in ['cpu cooler', 'cooler']:
-        return re.search(r'\bcooler\b', name_lower) or re.search(r'\bheatsink\b', name_lower)
-    
-    elif category_lower == 'keyboard':
-        return re.search(r'\bkeyboard\b', name_lower) is not None
-    
-    elif category_lower == 'mouse':
-        return re.search(r'\bmouse\b', name_lower) is not None
+# Products that are full systems (laptops, desktops, tablets) - should be skipped
+FULL_SYSTEM_PATTERNS = [
+    r'\blaptop\b', r'\bnotebook\b', r'\bmacbook\b', r'\bthinkpad\b',
+    r'\bideapad\b', r'\bvivobook\b', r'\bzenbook\b', r'\blegion\b',
+    r'\bpredator\b', r'\bnitro\b', r'\btuf gaming\b', r'\bloq\b', r'\byoga\b',
+    r'\bchromebook\b', r'\bultrabook\b', r'\bgalaxy book\b',
+    r'\balienware\b', r'\bxps\b', r'\blatitude\b', r'\bvostro\b',
+    r'\bdesktop\b', r'\ball[- ]?in[- ]?one\b', r'\bimac\b', r'\bmac mini\b',
+    r'\bthinkcentre\b', r'\boptiplex\b', r'\bideacentre\b',
+    r'\bpc build\b', r'\bbudget pc\b', r'\bgaming pc\b',
+    r'\btablet\b', r'\bipad\b', r'\bgalaxy tab\b', r'\bwalpad\b',
+    r'\bhonor pad\b', r'\bredmi pad\b', r'\blenovo tab\b', r'\btab m\d',
+]
+
+# Per-category "must match" indicators - STRICT matching
+CATEGORY_INDICATORS = {
+    # Must have DDR or specific RAM indicators (word boundary for "ram")
+    'ram': [r'\bddr[345]\b', r'\bdimm\b', r'\bsodimm\b', r'\bmemory module\b', r'\bram kit\b', r'\bram\b'],
+    'ssd': [r'\bssd\b', r'\bnvme\b', r'\bm\.2\b', r'\bsolid state\b'],
+    'hdd': [r'\bhdd\b', r'\bhard drive\b', r'\bhard disk\b', r'\b\d+\s*rpm\b'],
+    'gpu': [r'\bgraphics card\b', r'\bgeforce\b', r'\bradeon\b', r'\brtx\s*\d{4}\b', r'\bgtx\b', r'\bgpu\b'],
+    'monitor': [r'\bmonitor\b', r'\bdisplay\b'],
+    'motherboard': [r'\bmotherboard\b', r'\bmainboard\b'],
+    'power supply': [r'\bpower supply\b', r'\bpsu\b', r'\bsmps\b'],
+    'cabinet': [r'\bcase\b', r'\bcabinet\b', r'\bcasing\b'],
+    'cpu cooler': [r'\bcooler\b', r'\bheatsink\b'],
+    'keyboard': [r'\bkeyboard\b'],
+    'mouse': [r'\bmouse\b'],
+}
+
+# Alternate spellings shops and operators use for the same category
+CATEGORY_ALIASES = {
+    'memory': 'ram',
+    'solid state drive': 'ssd',
+    'hard disk': 'hdd',
+    'hard drive': 'hdd',
+    'cpu': 'processor',
+    'graphics card': 'gpu',
+    'psu': 'power supply',
+    'pc case': 'cabinet',
+    'casing': 'cabinet',
+    'cooler': 'cpu cooler',
+}
+
+# Compile each indicator list into one alternation pattern at import time so
+# the per-product check is a single C-level scan instead of a Python loop
+# re-matching pattern strings per call
+_FULL_SYSTEM_RE = re.compile('|'.join(FULL_SYSTEM_PATTERNS))
+_CATEGORY_RES = {cat: re.compile('|'.join(pats)) for cat, pats in CATEGORY_INDICATORS.items()}
+# Accessory categories never rejected just because a system name appears
+_SKIP_FULL_SYSTEM_CHECK = frozenset(['cabinet', 'cpu cooler', 'keyboard', 'mouse'])
+_RAM_RE = re.compile(r'\bram\b')
+_SSD_RE = re.compile(r'\bssd\b')
+
+
+@lru_cache(maxsize=None)
+def get_category_predicate(category_name):
+    """Resolve one category's rules into a `name_lower -> bool` predicate.
+
+    Alias lookup and rule dispatch happen once per distinct category name;
+    callers that classify thousands of rows pay only the compiled regex
+    searches per row. Bound methods are captured as defaults so the hot
+    path skips the attribute lookups too.
+    """
+    category_lower = CATEGORY_ALIASES.get(category_name.lower(), category_name.lower())
+
+    if category_lower == 'processor':
+        def predicate(name_lower, _fs=_FULL_SYSTEM_RE.search, _ram=_RAM_RE.search, _ssd=_SSD_RE.search):
+            if _fs(name_lower):
+                return False
+            # Names listing both RAM and SSD are prebuilt machines, not bare CPUs
+            return not (_ram(name_lower) and _ssd(name_lower))
+        return predicate
+
+    matcher = _CATEGORY_RES.get(category_lower)
+    if matcher is None:
+        logger.warning(f"is_product_in_category: unrecognized category '{category_name}', allowing all products by default")
+        return lambda name_lower: True
+
+    if category_lower in _SKIP_FULL_SYSTEM_CHECK:
+        return lambda name_lower, _search=matcher.search: _search(name_lower) is not None
+    return (lambda name_lower, _search=matcher.search, _fs=_FULL_SYSTEM_RE.search:
+            _fs(name_lower) is None and _search(name_lower) is not None)
+
 
-    logger.warning(f"is_product_in_category: unrecognized category '{category_name}', allowing all products by default")
-    return True
+def is_product_in_category(product_name, category_name):
+    return get_category_predicate(category_name)(product_name.lower())
 
 
 class Command(BaseCommand):
@@ -167,6 +173,12 @@ class Command(BaseCommand):
         shops_created = self.create_shops()
         self.stdout.write(self.style.SUCCESS(f'Shops ready: {shops_created}'))
 
+        # Resolve every Shop and Category once; save_shop_products used to
+        # run two lookup queries per shop/category pair (~150 per run).
+        # Read-only after this point, so safe to share across the workers
+        self._shops = {s.name: s for s in Shop.objects.all()}
+        self._categories = {c.name.lower(): c for c in Category.objects.all()}
+
         total_created = 0
         total_updated = 0
 
@@ -194,40 +206,84 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('\n=== Scraping all shops (sequential) ==='))
         for shop_name, scraper_fn in static_scrapers:
             self.stdout.write(f'\n[Shop] {shop_name}')
-            for category in categories:
-                search_term = category_to_search_term.get(category, category)
-                self.stdout.write(f'  Category: {category} (search: {search_term})')
+
+            # Ryans launches a Chromium instance per call on cloud hosting,
+            # so scrape all of its categories through one shared browser
+            # instead of paying the 1-2s startup for each category
+            if shop_name == 'Ryans':
+                search_terms = [category_to_search_term.get(c, c) for c in categories]
                 try:
-                    close_old_connections()
-                    result = scraper_fn(search_term, max_pages=max_pages)
-                    created, updated = self.save_shop_products(shop_name, result, category)
+                    results_by_term = scrape_ryans_catalog_batch(search_terms, max_pages=max_pages)
+                except Exception as e:
+                    logger.error(f"Error scraping {shop_name}: {e}")
+                    continue
+                for category in categories:
+                    search_term = category_to_search_term.get(category, category)
+                    self.stdout.write(f'  Category: {category} (search: {search_term})')
+                    try:
+                        close_old_connections()
+                        result = results_by_term.get(search_term) or {'products': []}
+                        created, updated = self.save_shop_products(shop_name, result, category)
+                        total_created += created
+                        total_updated += updated
+                    except Exception as e:
+                        logger.error(f"Error saving {shop_name}/{category}: {e}")
+                continue
+
+            # Static shops are requests-based, so run a few category
+            # pipelines (scrape + save) concurrently. Django hands each
+            # worker thread its own DB connection; 3 workers keeps us under
+            # the shops' rate limits while overlapping network and DB time
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = [
+                    pool.submit(self._process_category, shop_name, scraper_fn,
+                                category, category_to_search_term, max_pages)
+                    for category in categories
+                ]
+                for future in as_completed(futures):
+                    created, updated = future.result()
                     total_created += created
                     total_updated += updated
-                except Exception as e:
-                    logger.error(f"Error scraping {shop_name}/{category}: {e}")
 
         self.stdout.write(self.style.SUCCESS(
             f'\nCatalog populated: {total_created} products created, {total_updated} updated'
         ))
 
+    def _process_category(self, shop_name, scraper_fn, category,
+                          category_to_search_term, max_pages):
+        """Scrape one shop/category pair and save it - one thread's work."""
+        search_term = category_to_search_term.get(category, category)
+        self.stdout.write(f'  Category: {category} (search: {search_term})')
+        try:
+            close_old_connections()
+            result = scraper_fn(search_term, max_pages=max_pages)
+            return self.save_shop_products(shop_name, result, category)
+        except Exception as e:
+            logger.error(f"Error scraping {shop_name}/{category}: {e}")
+            return 0, 0
+        finally:
+            # Leave no stale per-thread connection behind for reuse by a
+            # later task on this worker
+            close_old_connections()
+
     def create_categories(self, category_names):
-        count = 0
-        for cat_name in category_names:
-            from django.utils.text import slugify
-            slug = slugify(cat_name)
-
-            # Use slug as lookup to avoid duplicate slug errors
-            _, created = Category.objects.update_or_create(
-                slug=slug,
-                defaults={'name': cat_name, 'is_active': True}
-            )
-            if created:
-                count += 1
+        from django.utils.text import slugify
 
-        return count
+        # One upsert keyed on slug instead of an update_or_create round-trip
+        # per category; update_fields keeps the old reactivation behaviour
+        # (existing categories get is_active=True again). Slug is set
+        # explicitly because bulk_create bypasses Category.save()
+        before = Category.objects.count()
+        Category.objects.bulk_create(
+            [Category(name=cat_name, slug=slugify(cat_name), is_active=True)
+             for cat_name in category_names],
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=['name', 'is_active'],
+        )
+        return Category.objects.count() - before
 
     def create_shops(self):
-        count = 0
         shops = [
             {'name': 'StarTech', 'website_url': 'https://www.startech.com.bd', 'logo_url': 'https://www.startech.com.bd/image/catalog/logo.png', 'priority': 5},
             {'name': 'Ryans', 'website_url': 'https://www.ryans.com', 'logo_url': 'https://www.ryans.com/assets/images/ryans-logo.svg', 'priority': 4},
@@ -241,21 +297,25 @@ class Command(BaseCommand):
             {'name': 'GlobalBrand', 'website_url': 'https://www.globalbrand.com.bd', 'logo_url': 'https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcS54nXVOGF6pUE6_5XWEidHmAWhVnj8QyNRog&s', 'priority': 1},
         ]
         
-        for shop_data in shops:
-            _, created = Shop.objects.get_or_create(
+        # Insert-if-missing in one statement, matching get_or_create's
+        # leave-existing-rows-alone semantics; slug set explicitly since
+        # bulk_create bypasses Shop.save()
+        from django.utils.text import slugify
+
+        before = Shop.objects.count()
+        Shop.objects.bulk_create(
+            [Shop(
                 name=shop_data['name'],
-                defaults={
-                    'website_url': shop_data['website_url'],
-                    'logo_url': shop_data['logo_url'],
-                    'priority': shop_data['priority'],
-                    'is_active': True,
-                    'scraping_enabled': True
-                }
-            )
-            if created:
-                count += 1
-        
-        return count
+                slug=slugify(shop_data['name']),
+                website_url=shop_data['website_url'],
+                logo_url=shop_data['logo_url'],
+                priority=shop_data['priority'],
+                is_active=True,
+                scraping_enabled=True,
+            ) for shop_data in shops],
+            ignore_conflicts=True,
+        )
+        return Shop.objects.count() - before
 
     def save_shop_products(self, shop_name, shop_data, category_name):
         """Save products from a single shop with proper connection management"""
@@ -263,16 +323,12 @@ class Command(BaseCommand):
         updated_count = 0
         
         self.stdout.write(f'  Saving {shop_name} products ({len(shop_data.get("products", []))} items)...')
-        
-        # Close old connections before starting
-        close_old_connections()
-        
-        # Get the category
-        category = Category.objects.filter(name__iexact=category_name).first()
-        
-        try:
-            shop = Shop.objects.get(name=shop_name)
-        except Shop.DoesNotExist:
+
+        # Dict lookups against the per-run caches built in handle()
+        category = self._categories.get(category_name.lower())
+
+        shop = self._shops.get(shop_name)
+        if shop is None:
             return 0, 0
         
         if shop_data.get('logo') and not shop.logo_url:
@@ -283,14 +339,17 @@ class Command(BaseCommand):
         if not products_data:
             return 0, 0
         
-        # Process in small batches to prevent long-running transactions
-        batch_size = 50
+        # Process in batches to prevent long-running transactions. 500 keeps
+        # each transaction well under a second while cutting the number of
+        # prefetch/bulk-write round-trips 10x versus the old 50-row batches
+        # Connection hygiene lives at the task boundary (_process_category
+        # runs close_old_connections before and after each category);
+        # closing around every batch forced a fresh TCP+TLS+auth handshake
+        # per 500 rows on the non-pooled transaction-pooler config
+        batch_size = 500
         for i in range(0, len(products_data), batch_size):
             batch = products_data[i:i + batch_size]
-            
-            # Close connections before each batch
-            close_old_connections()
-            
+
             try:
                 with transaction.atomic():
                     created, updated = self._save_product_batch(batch, shop, category)
@@ -298,9 +357,6 @@ class Command(BaseCommand):
                     updated_count += updated
             except Exception as e:
                 logger.error(f"Error saving batch for {shop_name}: {e}")
-            finally:
-                # Always close connections after batch
-                close_old_connections()
         
         self.stdout.write(f'    {shop_name}: {created_count} created, {updated_count} updated')
         return created_count, updated_count
@@ -314,53 +370,36 @@ class Command(BaseCommand):
         
         # Get category name for filtering
         category_name = category.name if category else ''
-        
-        # Normalize URLs to prevent duplicates from pagination parameters
-        # Extract URLs for this batch (after normalization)
-        product_urls = []
-        for p in batch:
-            raw_url = p.get('link', '')
-            if raw_url and raw_url not in ['#', 'Link not found', '']:
-                normalized = normalize_product_url(raw_url)
-                product_urls.append(normalized)
-        
-        # Fetch existing products for this batch only (not all shop products!)
-        existing_by_url = {
-            p.product_url: p for p in Product.objects.filter(
-                shop=shop,
-                product_url__in=product_urls
-            ).only('id', 'name', 'product_url', 'current_price')
-        }
-        
-        products_to_create = []
-        products_to_update = []
-        price_histories = []
-        restocked_product_ids = []
-        # Track URLs we're adding in this batch to prevent duplicates within the batch
-        urls_in_batch = set(existing_by_url.keys())
-        
+
+        # Single cleaning pass over the raw dicts: URL validation and
+        # normalization, in-batch dedup (ON CONFLICT DO UPDATE can't touch
+        # the same row twice in one statement) and the category filter all
+        # happen here, so the prefetch below only fetches rows we will
+        # actually write and the raw dicts are never walked again
+        cleaned = []
+        urls_in_batch = set()
         for product_data in batch:
-            price = product_data.get('price')
             raw_url = product_data.get('link', '')
-            product_name = product_data.get('name', 'Unknown Product')[:500]
-            
             if not raw_url or raw_url in ['#', 'Link not found', '']:
                 continue
-            
+
             # Normalize the URL to prevent duplicates from pagination
             product_url = normalize_product_url(raw_url)
-            
+
             # Skip if we already processed this URL in this batch
-            if product_url in urls_in_batch and product_url not in existing_by_url:
+            if product_url in urls_in_batch:
                 continue
             urls_in_batch.add(product_url)
-            
+
+            product_name = product_data.get('name', 'Unknown Product')[:500]
+
             # Skip products that don't actually belong to this category
             # (e.g., laptops appearing in RAM search because they have "16GB RAM" in name)
             if category_name and not is_product_in_category(product_name, category_name):
                 skipped_count += 1
                 continue
-            
+
+            price = product_data.get('price')
             if isinstance(price, str) or price == 0 or price is None:
                 stock_status = 'out_of_stock'
                 is_available = False
@@ -369,79 +408,123 @@ class Command(BaseCommand):
                 stock_status = 'in_stock'
                 is_available = True
                 current_price = price
-            
-            # Check if product exists by URL
-            existing_product = existing_by_url.get(product_url)
-            
-            if existing_product:
-                previous_stock_status = existing_product.stock_status
-                previous_is_available = existing_product.is_available
-                previous_price = existing_product.current_price
-
-                # Update existing
-                existing_product.name = product_name
-                existing_product.category = category
-                existing_product.image_url = product_data.get('img', '')
-                existing_product.current_price = current_price
-                existing_product.stock_status = stock_status
-                existing_product.is_available = is_available
-                existing_product.last_scraped = now
-                products_to_update.append(existing_product)
+
+            cleaned.append((product_url, product_name, product_data.get('img', ''),
+                            current_price, stock_status, is_available))
+
+        # Fetch existing products for this batch only (not all shop products!)
+        # The rows are only read (for history/restock comparisons), so plain
+        # values() dicts skip model-instance construction and deferred-field
+        # bookkeeping for every existing row
+        existing_by_url = {
+            row['product_url']: row for row in Product.objects.filter(
+                shop=shop,
+                product_url__in=[row[0] for row in cleaned]
+            ).values('id', 'product_url', 'name', 'category_id', 'image_url',
+                     'current_price', 'stock_status', 'is_available')
+        }
+
+        products_to_save = []
+        price_histories = []
+        restocked_product_ids = []
+        unchanged_ids = []
+        category_id = category.id if category else None
+        # URLs that are new this batch - they get an initial history entry
+        # once bulk_create hands back their primary keys
+        new_urls = set()
+
+        for (product_url, product_name, image_url,
+             current_price, stock_status, is_available) in cleaned:
+            # The prefetched row dict is only read, for the no-change check
+            # and price-history/restock comparisons
+            existing = existing_by_url.get(product_url)
+
+            # On steady-state runs most rows are byte-identical; keep them
+            # out of the upsert (no dead tuple, no WAL) and refresh their
+            # last_scraped with one UPDATE after the loop
+            if (
+                existing
+                and existing['name'] == product_name
+                and existing['category_id'] == category_id
+                and existing['image_url'] == image_url
+                and existing['stock_status'] == stock_status
+                and existing['is_available'] == is_available
+                and int(existing['current_price'] * 100) == round(current_price * 100)
+            ):
+                unchanged_ids.append(existing['id'])
                 updated_count += 1
-                
-                # Price history if changed
-                if float(previous_price) != float(current_price):
+                continue
+
+            products_to_save.append(Product(
+                shop=shop,
+                product_url=product_url,
+                name=product_name,
+                category=category,
+                image_url=image_url,
+                current_price=current_price,
+                stock_status=stock_status,
+                is_available=is_available,
+                last_scraped=now
+            ))
+
+            if existing:
+                updated_count += 1
+
+                # Price history if changed - compared in integer cents:
+                # exact for the stored Decimal (2dp) and immune to float
+                # representation noise on the scraped side
+                if int(existing['current_price'] * 100) != round(current_price * 100):
                     price_histories.append(PriceHistory(
-                        product=existing_product,
+                        product_id=existing['id'],
                         price=current_price,
                         stock_status=stock_status,
                         recorded_at=now
                     ))
 
                 if (
-                    previous_stock_status == 'out_of_stock'
-                    and previous_is_available is False
+                    existing['stock_status'] == 'out_of_stock'
+                    and existing['is_available'] is False
                     and stock_status == 'in_stock'
                     and is_available is True
                 ):
-                    restocked_product_ids.append(existing_product.id)
+                    restocked_product_ids.append(existing['id'])
             else:
-                # Create new
-                new_product = Product(
-                    shop=shop,
-                    product_url=product_url,
-                    name=product_name,
-                    category=category,
-                    image_url=product_data.get('img', ''),
-                    current_price=current_price,
-                    stock_status=stock_status,
-                    is_available=is_available,
-                    last_scraped=now
-                )
-                products_to_create.append(new_product)
                 created_count += 1
-        
-        # Bulk operations
-        if products_to_create:
-            created_products = Product.objects.bulk_create(products_to_create, batch_size=50, ignore_conflicts=True)
-            for product in created_products:
-                if product.pk:
+                new_urls.add(product_url)
+
+        if unchanged_ids:
+            Product.objects.filter(id__in=unchanged_ids).update(last_scraped=now)
+
+        # Single INSERT ... ON CONFLICT (shop_id, product_url) DO UPDATE
+        # covers creates and updates alike, and (unlike ignore_conflicts)
+        # the returned objects carry their primary keys. Sorted by URL so
+        # concurrent category pipelines hitting overlapping products take
+        # their row locks in the same order and can't deadlock each other
+        if products_to_save:
+            products_to_save.sort(key=lambda p: p.product_url)
+            saved_products = Product.objects.bulk_create(
+                products_to_save,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['shop', 'product_url'],
+                update_fields=['name', 'category', 'image_url', 'current_price',
+                               'stock_status', 'is_available', 'last_scraped'],
+            )
+            # Both supported backends return rows from the upsert
+            # (can_return_rows_from_bulk_insert), so every saved object
+            # carries its pk - no silent 'if product.pk' skip that used to
+            # drop initial history under ignore_conflicts
+            for product in saved_products:
+                if product.product_url in new_urls:
                     price_histories.append(PriceHistory(
                         product=product,
                         price=product.current_price,
                         stock_status=product.stock_status,
                         recorded_at=now
                     ))
-        
-        if products_to_update:
-            Product.objects.bulk_update(
-                products_to_update,
-                ['name', 'category', 'image_url', 'current_price', 'stock_status', 'is_available', 'last_scraped'],
-                batch_size=50
-            )
-        
+
         if price_histories:
-            PriceHistory.objects.bulk_create(price_histories, batch_size=50)
+            self._write_price_histories(price_histories)
 
         notification_summary = send_back_in_stock_notifications(restocked_product_ids)
         if notification_summary['sent']:
@@ -450,6 +533,31 @@ class Command(BaseCommand):
                     f"Sent {notification_summary['sent']} stock notification emails for {notification_summary['products']} products"
                 )
             )
-        
+
         return created_count, updated_count
 
+    def _write_price_histories(self, price_histories):
+        """Append price-history rows, via COPY on PostgreSQL.
+
+        PriceHistory is append-only and the biggest write per run, so on
+        Postgres we stream the rows over COPY (psycopg 3) instead of a
+        parameterized multi-row INSERT; other backends keep bulk_create.
+        Runs inside the caller's per-batch transaction.
+        """
+        if connection.vendor != 'postgresql':
+            PriceHistory.objects.bulk_create(price_histories, batch_size=500)
+            return
+
+        with connection.cursor() as cursor:
+            with cursor.copy(
+                'COPY products_pricehistory '
+                '(product_id, price, stock_status, recorded_at) FROM STDIN'
+            ) as copy:
+                for history in price_histories:
+                    copy.write_row((
+                        history.product_id,
+                        history.price,
+                        history.stock_status,
+                        history.recorded_at,
+                    ))
+
@@ -1,43 +1,12 @@
+from collections import namedtuple
+
 from django.core.management.base import BaseCommand
 from django.db.models import Count
-from products.models import Product, PriceHistory
-from django.db import transaction
-import urllib.parse
-
+from products.models import Product, PriceHistory, StockSubscription, Wishlist
+from products.utils.catalog_scraper import normalize_product_url
+from django.db import connection, transaction
 
-def normalize_product_url(url):
-    """
-    Normalize product URL by removing pagination and search query parameters.
-    This helps identify duplicate products that have different page numbers.
-    """
-    if not url:
-        return url
-    
-    try:
-        parsed = urllib.parse.urlparse(url)
-        query_params = urllib.parse.parse_qs(parsed.query)
-        
-        # Remove pagination and search-related query parameters
-        params_to_remove = ['page', 'search', 'q', 'keyword', 'sort', 'order', 'limit']
-        filtered_params = {
-            k: v for k, v in query_params.items() 
-            if k.lower() not in params_to_remove
-        }
-        
-        # Rebuild the URL without the removed parameters
-        new_query = urllib.parse.urlencode(filtered_params, doseq=True) if filtered_params else ''
-        normalized = urllib.parse.urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            parsed.path,
-            parsed.params,
-            new_query,
-            ''
-        ))
-        
-        return normalized
-    except Exception:
-        return url
+_CandidateRow = namedtuple('CandidateRow', ['id', 'name', 'shop_id', 'product_url', 'updated_at'])
 
 
 class Command(BaseCommand):
@@ -65,72 +34,145 @@ class Command(BaseCommand):
             action='store_true',
             help='Also find duplicates by normalizing URLs (removing page/search params)'
         )
+        parser.add_argument(
+            '--fast',
+            action='store_true',
+            help='Delete with _raw_delete (skips signals and the cascade collector)'
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         shop_filter = options['shop']
         limit = options['limit']
         normalize_urls = options['normalize_urls']
-        
+        fast = options['fast']
+
         self.stdout.write(self.style.WARNING('\n=== Product Duplicate Removal Tool ===\n'))
-        
+
         if normalize_urls:
             self.stdout.write(self.style.WARNING('URL normalization enabled - will also detect duplicates with different page params\n'))
-            self.remove_url_normalized_duplicates(dry_run, shop_filter, limit)
+            self.remove_url_normalized_duplicates(dry_run, shop_filter, limit, fast)
         else:
-            self.remove_name_shop_duplicates(dry_run, shop_filter, limit)
+            self.remove_name_shop_duplicates(dry_run, shop_filter, limit, fast)
     
-    def remove_url_normalized_duplicates(self, dry_run, shop_filter, limit):
+    def _product_count_estimate(self):
+        """Cheap table-size figure for progress reports.
+
+        On PostgreSQL this reads the planner's reltuples estimate - a
+        single catalog row instead of an O(N) COUNT(*) scan. Falls back
+        to an exact count elsewhere or when statistics are missing.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE relname = 'products_product'"
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+        return Product.objects.count()
+
+    def _raw_delete_batch(self, batch):
+        """Delete one id batch with QuerySet._raw_delete.
+
+        _raw_delete issues a single DELETE without building the cascade
+        collector or firing pre/post_delete signals, so the referencing
+        tables must be cleared explicitly first. Cleanup has no signal
+        handlers worth running, hence the opt-in --fast flag.
+        """
+        for model in (StockSubscription, Wishlist, PriceHistory):
+            qs = model.objects.filter(product_id__in=batch)
+            qs._raw_delete(qs.db)
+        qs = Product.objects.filter(id__in=batch)
+        return qs._raw_delete(qs.db)
+
+    def _iter_candidate_rows(self, shop_id=None):
+        """Stream only rows that can belong to a duplicate group (PostgreSQL).
+
+        Two rows can only share a normalized URL if they share a shop and
+        everything before the '?', so grouping on split_part lets the
+        server find every possible duplicate pair without shipping the
+        whole table to Python.
+        """
+        query = (
+            "SELECT id, name, shop_id, product_url, updated_at "
+            "FROM products_product "
+            "WHERE (shop_id, split_part(product_url, '?', 1)) IN ("
+            "SELECT shop_id, split_part(product_url, '?', 1) "
+            "FROM products_product GROUP BY 1, 2 HAVING COUNT(*) > 1)"
+        )
+        params = []
+        if shop_id is not None:
+            query += ' AND shop_id = %s'
+            params.append(shop_id)
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _CandidateRow(*row)
+
+    def remove_url_normalized_duplicates(self, dry_run, shop_filter, limit, fast=False):
         """Remove duplicates based on normalized URL (removing pagination params) - OPTIMIZED"""
         from products.models import Shop
-        
+
         self.stdout.write('Scanning for duplicates (this may take a moment)...')
-        
-        # Build base query
-        products_query = Product.objects.all()
-        
+
+        shop = None
         if shop_filter:
             try:
                 shop = Shop.objects.get(name__iexact=shop_filter)
-                products_query = products_query.filter(shop=shop)
                 self.stdout.write(f'Filtering by shop: {shop.name}\n')
             except Shop.DoesNotExist:
                 self.stdout.write(self.style.ERROR(f'Shop "{shop_filter}" not found'))
                 return
-        
-        # Only fetch the fields we need - much faster!
-        products_query = products_query.only('id', 'name', 'shop_id', 'product_url', 'updated_at')
-        
-        # Process in batches using iterator to reduce memory
-        products_by_normalized = {}
-        batch_size = 5000
+
+        if connection.vendor == 'postgresql':
+            # Duplicate detection happens in the database: only members of a
+            # (shop, base-url) group with more than one row reach Python
+            rows = self._iter_candidate_rows(shop.id if shop else None)
+        else:
+            products_query = Product.objects.all()
+            if shop:
+                products_query = products_query.filter(shop=shop)
+            # Raw named tuples instead of model instances - the scan only
+            # reads five columns, so skip per-row model construction
+            rows = (
+                products_query
+                .values_list('id', 'name', 'shop_id', 'product_url', 'updated_at', named=True)
+                .iterator(chunk_size=10000)
+            )
+
+        # Two-tier grouping: singletons (the vast majority of keys) sit in
+        # `seen` as a bare tuple each; a key only gets a list in
+        # `duplicate_groups` once a second row actually collides with it.
+        # No post-scan filter pass and no list allocation per unique key.
+        seen = {}
+        duplicate_groups = {}
         total_processed = 0
-        
-        for product in products_query.iterator(chunk_size=batch_size):
+
+        for product in rows:
             normalized_url = normalize_product_url(product.product_url)
             key = (product.shop_id, normalized_url)
-            if key not in products_by_normalized:
-                products_by_normalized[key] = []
-            # Store only what we need: (id, name, updated_at, original_url)
-            products_by_normalized[key].append({
-                'id': product.id,
-                'name': product.name,
-                'updated_at': product.updated_at,
-                'url': product.product_url,
-                'shop_id': product.shop_id
-            })
+            if key in duplicate_groups:
+                duplicate_groups[key].append(product)
+            elif key in seen:
+                duplicate_groups[key] = [seen.pop(key), product]
+            else:
+                seen[key] = product
             total_processed += 1
             if total_processed % 10000 == 0:
                 self.stdout.write(f'  Processed {total_processed:,} products...')
-        
+
         self.stdout.write(f'  Total processed: {total_processed:,} products')
-        
-        # Find groups with duplicates
-        duplicate_groups = {k: v for k, v in products_by_normalized.items() if len(v) > 1}
-        
+
         # Free memory
-        del products_by_normalized
-        
+        del seen
+
         if limit:
             duplicate_groups = dict(list(duplicate_groups.items())[:limit])
         
@@ -148,11 +190,11 @@ class Command(BaseCommand):
         shop_names = {s.id: s.name for s in Shop.objects.all()}
         for i, ((shop_id, norm_url), products) in enumerate(list(duplicate_groups.items())[:10], 1):
             self.stdout.write(
-                f"  {i}. '{products[0]['name'][:50]}...' from {shop_names.get(shop_id, 'Unknown')} "
+                f"  {i}. '{products[0].name[:50]}...' from {shop_names.get(shop_id, 'Unknown')} "
                 f"({len(products)} copies)"
             )
             for p in products:
-                self.stdout.write(f"      - ID: {p['id']}, URL: {p['url'][:70]}...")
+                self.stdout.write(f"      - ID: {p.id}, URL: {p.product_url[:70]}...")
         
         if dry_run:
             self.stdout.write(self.style.WARNING('\nDRY RUN MODE - No data will be deleted'))
@@ -175,30 +217,57 @@ class Command(BaseCommand):
         
         for (shop_id, norm_url), products in duplicate_groups.items():
             # Sort by updated_at desc, keep the most recent
-            products.sort(key=lambda p: p['updated_at'], reverse=True)
-            
+            products.sort(key=lambda p: p.updated_at, reverse=True)
+
             # Collect IDs to delete (skip the first/newest)
             for dup in products[1:]:
-                ids_to_delete.append(dup['id'])
-        
-        # Delete in batches
-        batch_size = 1000
-        self.stdout.write(f'Deleting {len(ids_to_delete)} duplicates in batches...')
+                ids_to_delete.append(dup.id)
         
-        for i in range(0, len(ids_to_delete), batch_size):
-            batch = ids_to_delete[i:i + batch_size]
-            with transaction.atomic():
-                deleted, _ = Product.objects.filter(id__in=batch).delete()
-                deleted_count += deleted
-            self.stdout.write(f'  Deleted {min(i + batch_size, len(ids_to_delete)):,} / {len(ids_to_delete):,}')
+        self.stdout.write(f'Deleting {len(ids_to_delete)} duplicates...')
+
+        # Size the table once before deleting; the closing report is then
+        # plain subtraction instead of a second full COUNT(*)
+        initial_count = self._product_count_estimate()
+
+        if connection.vendor == 'postgresql':
+            # One DELETE per table via ANY(%s) in a single transaction;
+            # referencing tables go first since the raw statements skip the
+            # ORM cascade
+            with transaction.atomic(), connection.cursor() as cursor:
+                for table in ('products_stocksubscription', 'products_wishlist',
+                              'products_pricehistory'):
+                    cursor.execute(
+                        f'DELETE FROM {table} WHERE product_id = ANY(%s)',
+                        [ids_to_delete],
+                    )
+                cursor.execute(
+                    'DELETE FROM products_product WHERE id = ANY(%s)',
+                    [ids_to_delete],
+                )
+                deleted_count = cursor.rowcount
+        else:
+            batch_size = 1000
+            for i in range(0, len(ids_to_delete), batch_size):
+                batch = ids_to_delete[i:i + batch_size]
+                with transaction.atomic():
+                    if fast:
+                        deleted = self._raw_delete_batch(batch)
+                    else:
+                        deleted, _ = Product.objects.filter(id__in=batch).delete()
+                    deleted_count += deleted
+                self.stdout.write(f'  Deleted {min(i + batch_size, len(ids_to_delete)):,} / {len(ids_to_delete):,}')
         
         self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully removed {deleted_count} duplicate products'))
-        self.stdout.write(f'  Remaining products: {Product.objects.count():,}')
+        self.stdout.write(f'  Remaining products: ~{initial_count - deleted_count:,}')
 
-    def remove_name_shop_duplicates(self, dry_run, shop_filter, limit):
+    def remove_name_shop_duplicates(self, dry_run, shop_filter, limit, fast=False):
         """Original method: Remove duplicates based on name + shop"""
-        # Find duplicates (same name + shop)
-        duplicates_query = Product.objects.values('name', 'shop').annotate(
+        # Find duplicates (same name + shop). Plain values_list tuples
+        # (shop_id, name, count) instead of per-group dicts; shop_id leads so
+        # the GROUP BY lines up with the (shop, name) composite index for an
+        # index-only scan. Note named=True would not carry the annotation -
+        # the named-tuple class is built from the listed fields only
+        duplicates_query = Product.objects.values_list('shop_id', 'name').annotate(
             count=Count('id')
         ).filter(count__gt=1).order_by('-count')
         
@@ -222,21 +291,22 @@ class Command(BaseCommand):
             return
         
         total_duplicate_groups = len(duplicates)
-        total_products_to_delete = sum(d['count'] - 1 for d in duplicates)
+        total_products_to_delete = sum(count - 1 for _, _, count in duplicates)
         
         self.stdout.write(f'Found duplicate product groups: {total_duplicate_groups}')
         self.stdout.write(f'Total duplicate products to remove: {total_products_to_delete}\n')
         
-        # Show sample duplicates
+        # Show sample duplicates - shop names from one lookup dict instead
+        # of a Product query (plus FK fetch) per sample row
+        from products.models import Shop
+        shop_names = dict(Shop.objects.values_list('id', 'name'))
+
         self.stdout.write(self.style.WARNING('Top duplicate products:'))
-        for i, dup in enumerate(duplicates[:10], 1):
-            shop_name = Product.objects.filter(
-                name=dup['name'], 
-                shop_id=dup['shop']
-            ).first().shop.name
+        for i, (dup_shop_id, dup_name, dup_count) in enumerate(duplicates[:10], 1):
+            shop_name = shop_names.get(dup_shop_id, 'Unknown')
             self.stdout.write(
-                f"  {i}. '{dup['name'][:60]}...' from {shop_name} "
-                f"({dup['count']} copies)"
+                f"  {i}. '{dup_name[:60]}...' from {shop_name} "
+                f"({dup_count} copies)"
             )
         
         if total_duplicate_groups > 10:
@@ -250,14 +320,14 @@ class Command(BaseCommand):
             
             # Show detailed example of one duplicate group
             if duplicates:
-                example = duplicates[0]
+                example_shop_id, example_name, _ = duplicates[0]
                 example_products = Product.objects.filter(
-                    name=example['name'],
-                    shop_id=example['shop']
+                    name=example_name,
+                    shop_id=example_shop_id
                 ).order_by('-updated_at')
-                
+
                 self.stdout.write('\nExample duplicate group:')
-                self.stdout.write(f"  Product: {example['name'][:80]}")
+                self.stdout.write(f"  Product: {example_name[:80]}")
                 for idx, p in enumerate(example_products):
                     status = '✓ KEEP (most recent)' if idx == 0 else '✗ DELETE'
                     self.stdout.write(
@@ -304,7 +374,11 @@ class Command(BaseCommand):
             return
         
         self.stdout.write(f'Found {len(ids_to_delete)} products to delete')
-        
+
+        # Same trick as the URL path: size the table once up front and
+        # derive the closing figure arithmetically
+        initial_count = self._product_count_estimate()
+
         # Delete in small batches to avoid deadlocks
         deleted_count = 0
         batch_size = 500
@@ -322,7 +396,10 @@ class Command(BaseCommand):
             for attempt in range(max_retries):
                 try:
                     with transaction.atomic():
-                        deleted, _ = Product.objects.filter(id__in=batch).delete()
+                        if fast:
+                            deleted = self._raw_delete_batch(batch)
+                        else:
+                            deleted, _ = Product.objects.filter(id__in=batch).delete()
                         deleted_count += deleted
                     break  # Success
                 except Exception as e:
@@ -335,5 +412,5 @@ class Command(BaseCommand):
             self.stdout.write(f'  Batch {batch_num}/{total_batches}: Deleted {deleted} products')
         
         self.stdout.write(self.style.SUCCESS(f'\n✓ Successfully removed {deleted_count} duplicate products'))
-        self.stdout.write(f'  Remaining products: {Product.objects.count():,}')
+        self.stdout.write(f'  Remaining products: ~{initial_count - deleted_count:,}')
         self.stdout.write(self.style.SUCCESS('  Database cleanup completed!\n'))
@@ -4,7 +4,70 @@ Management command to verify scraping setup and test the cache
 from django.core.management.base import BaseCommand
 from django.core.cache import cache
 from django.db import connection
+import selectors
+import socket
 import sys
+import time
+
+# Shop hosts probed by the connectivity check
+SCRAPE_HOSTS = [
+    ('www.startech.com.bd', 443),
+    ('www.skyland.com.bd', 443),
+    ('www.ultratech.com.bd', 443),
+    ('www.ryans.com', 443),
+    ('www.pchouse.com.bd', 443),
+]
+
+
+def check_connectivity(hosts, timeout=5):
+    """Probe all hosts concurrently with non-blocking sockets.
+
+    Every address returned by getaddrinfo (IPv4 and IPv6) is connected
+    in parallel, so the whole check finishes within one shared timeout
+    instead of serial per-host waits.
+    Returns the set of reachable host names.
+    """
+    sel = selectors.DefaultSelector()
+    sockets = []
+    reachable = set()
+
+    for host, port in hosts:
+        try:
+            addrinfos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            continue
+        for family, socktype, proto, _, sockaddr in addrinfos:
+            try:
+                s = socket.socket(family, socktype, proto)
+            except OSError:
+                continue
+            s.setblocking(False)
+            s.connect_ex(sockaddr)
+            sel.register(s, selectors.EVENT_WRITE, host)
+            sockets.append(s)
+
+    try:
+        remaining = timeout
+        deadline = time.monotonic() + timeout
+        while remaining > 0 and len(reachable) < len(hosts):
+            events = sel.select(timeout=remaining)
+            if not events:
+                break
+            for key, _ in events:
+                sock, host = key.fileobj, key.data
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    reachable.add(host)
+                sel.unregister(sock)
+            remaining = deadline - time.monotonic()
+    finally:
+        for s in sockets:
+            try:
+                s.close()
+            except OSError:
+                pass
+        sel.close()
+
+    return reachable
 
 
 class Command(BaseCommand):
@@ -166,6 +229,22 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'   ❌ Error checking status: {str(e)}'))
             all_good = False
         
+        self.stdout.write('')
+
+        # 7. Check Shop Connectivity
+        self.stdout.write('7. Checking Shop Connectivity (5s budget)...')
+        try:
+            reachable = check_connectivity(SCRAPE_HOSTS)
+            for host, _ in SCRAPE_HOSTS:
+                if host in reachable:
+                    self.stdout.write(self.style.SUCCESS(f'   ✅ {host} reachable'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'   ⚠️  {host} not reachable'))
+            if not reachable:
+                self.stdout.write(self.style.WARNING('   ⚠️  No shops reachable - check outbound network/DNS'))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'   ❌ Connectivity check error: {str(e)}'))
+
         self.stdout.write('')
         self.stdout.write('='*50)
         
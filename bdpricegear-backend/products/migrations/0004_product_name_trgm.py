@@ -0,0 +1,37 @@
+# Trigram GIN index for admin product-name search on PostgreSQL.
+# Local SQLite development is unaffected - both operations no-op there.
+
+from django.db import migrations
+
+
+def create_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS product_name_trgm '
+        'ON products_product USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS product_name_trgm')
+
+
+def create_pg_trgm_extension(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_stocksubscription'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pg_trgm_extension, migrations.RunPython.noop),
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+    ]
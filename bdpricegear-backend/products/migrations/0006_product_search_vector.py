@@ -0,0 +1,34 @@
+# Expression GIN index backing the full-text search path in
+# ProductFilter.filter_search on PostgreSQL. The expression matches the
+# weighted SearchVector the filter builds so the planner can use the index.
+# Local SQLite development is unaffected - both operations no-op there.
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS product_search_vec '
+        'ON products_product USING gin ('
+        "(setweight(to_tsvector('english'::regconfig, COALESCE(name, '')), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')))"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS product_search_vec')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -95,6 +95,14 @@ class Product(models.Model):
             models.Index(fields=['category', 'shop']),
             models.Index(fields=['stock_status', 'is_available']),
             models.Index(fields=['-created_at']),
+            # Composite indexes backing the hot ProductFilter predicates
+            # (category/shop filters always combine with availability)
+            models.Index(fields=['category', 'is_available'], name='products_pr_cat_avail_idx'),
+            models.Index(fields=['shop', 'is_available'], name='products_pr_shop_avail_idx'),
+            models.Index(fields=['current_price'], name='products_pr_price_idx'),
+            # Lets the duplicate-cleanup GROUP BY shop_id, name run as an
+            # index-only scan instead of a full table scan
+            models.Index(fields=['shop', 'name'], name='products_pr_shop_name_idx'),
         ]
         unique_together = ['shop', 'product_url']  # Prevent duplicate products
     
@@ -15,7 +15,12 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'description', 'is_active', 'product_count', 'created_at']
     
     def get_product_count(self, obj):
-        # Count all products in this category (including unavailable)
+        # Count all products in this category (including unavailable).
+        # The list viewset annotates product_count so a whole listing is
+        # one GROUP BY query; nested use falls back to a per-object count.
+        count = getattr(obj, 'product_count', None)
+        if count is not None:
+            return count
         return obj.products.count()
 
 
@@ -28,7 +33,11 @@ class ShopSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'logo_url', 'website_url', 'is_active', 'priority', 'product_count']
     
     def get_product_count(self, obj):
-        # Count all products in this shop (including unavailable)
+        # Count all products in this shop (including unavailable).
+        # Annotated by the list viewset; see CategorySerializer above.
+        count = getattr(obj, 'product_count', None)
+        if count is not None:
+            return count
         return obj.products.count()
 
 
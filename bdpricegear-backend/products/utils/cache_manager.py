@@ -1,61 +1,78 @@
-import hashlib
+import heapq
 import time
-from typing import Dict, Any, Optional
+from typing import Any, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger("cache_manager")
 
 class SimpleCache:
     def __init__(self, default_ttl: int = 300):  # 5 min
-        self.cache: Dict[str, Dict] = {}
+        # key -> (expires_at, data); tuples keep entries compact
+        self.cache: Dict[str, Tuple[float, Any]] = {}
         self.default_ttl = default_ttl
-    
+        # (expires_at, key) min-heap so expiry pops the oldest entries first
+        # instead of scanning the whole dict; may hold superseded entries
+        self._expiry_heap = []
+        # Pre-bound hot-path refs: one attribute lookup less per get/set
+        self._cache_get = self.cache.get
+        self._now = time.monotonic
+
     def _generate_key(self, product: str) -> str:
-        # generate cache key 
-        return hashlib.md5(product.lower().strip().encode()).hexdigest()
-    
+        # generate cache key - the normalized name itself; this is an
+        # in-process dict, so hashing it first (previously md5) only added overhead
+        return product.lower().strip()
+
     def get(self, product: str) -> Optional[Any]:
-        # get data from cache
+        # get data from cache - single dict probe instead of `in` + index
         key = self._generate_key(product)
-        
-        if key not in self.cache:
+        entry = self._cache_get(key)
+
+        if entry is None:
             return None
-            
-        entry = self.cache[key]
-        current_time = time.time()
-        
-        # Check if expired
-        if current_time > entry['expires_at']:
+
+        # Check if expired (monotonic clock - immune to wall-clock jumps)
+        if self._now() > entry[0]:
             del self.cache[key]
             return None
-            
+
         logger.info(f"Cache hit for product: {product}")
-        return entry['data']
-    
+        return entry[1]
+
     def set(self, product: str, data: Any, ttl: Optional[int] = None) -> None:
-        #  Store data in cache 
+        #  Store data in cache
         key = self._generate_key(product)
         ttl = ttl or self.default_ttl
-        
-        self.cache[key] = {
-            'data': data,
-            'expires_at': time.time() + ttl,
-        }
-        
+        now = self._now()
+
+        self.cache[key] = (now + ttl, data)
+        heapq.heappush(self._expiry_heap, (now + ttl, key))
+        # Lazily drop anything already expired so the heap and dict stay small
+        self._purge_expired(now)
+
         logger.info(f"Cache set for product: {product}")
-    
+
+    def _purge_expired(self, now: float) -> int:
+        # Pop only genuinely expired heap heads - O(expired), not O(cache)
+        heap = self._expiry_heap
+        cache = self.cache
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = cache.get(key)
+            # Skip heap entries superseded by a later set() of the same key
+            if entry is not None and entry[0] == expires_at:
+                del cache[key]
+                removed += 1
+        return removed
+
     def clear_expired(self) -> int:
         # clean up (expired)
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if current_time > entry['expires_at']
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-            
-        return len(expired_keys)
+        return self._purge_expired(self._now())
 
 # Global cache instance
-price_cache = SimpleCache(default_ttl=300)  # 5 min cache
\ No newline at end of file
+price_cache = SimpleCache(default_ttl=300)  # 5 min cache
+
+# Pre-bound module-level aliases so hot callers skip the attribute chain
+cache_get = price_cache.get
+cache_set = price_cache.set
+cache_clear_expired = price_cache.clear_expired
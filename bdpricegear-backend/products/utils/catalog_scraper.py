@@ -2,10 +2,12 @@ import asyncio
 import logging
 import os
 import re
+import threading
 import uuid
 import urllib.parse
 import time
 import random
+from functools import lru_cache
 
 from bs4 import BeautifulSoup
 import requests
@@ -14,6 +16,40 @@ from playwright.async_api import async_playwright, TimeoutError as PlaywrightTim
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("catalog_scraper")
 
+# Resource types the Playwright scrapers never need - aborted at the
+# network layer so pages render faster and transfer far fewer bytes
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+
+async def _block_heavy_resources(context):
+    """Abort image/media/font requests on a Playwright context."""
+    async def _route_handler(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", _route_handler)
+
+
+def _chromium_launch_args(extra_args=None):
+    """Common Chromium flags for the scraper browsers.
+
+    --disable-dev-shm-usage forces Chromium to spill shared memory to
+    disk-backed /tmp, so it is only applied when the deployment has not
+    declared a large tmpfs /dev/shm (LARGE_SHM env, e.g. --shm-size=512m).
+    """
+    args = [
+        '--disable-blink-features=AutomationControlled',
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+    ]
+    if not os.environ.get('LARGE_SHM'):
+        args.append('--disable-dev-shm-usage')
+    if extra_args:
+        args.extend(extra_args)
+    return args
+
 # Rotating user agents to avoid detection
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -27,9 +63,48 @@ def get_random_user_agent():
     # Return a random user agent to avoid detection
     return random.choice(USER_AGENTS)
 
+class _PerHostThrottle:
+    """Process-wide minimum spacing between requests to the same host.
+
+    With several category pipelines scraping the same shop concurrently,
+    per-thread delays no longer bound the per-host request rate. This
+    gate does: callers to the same host are spaced min_interval apart
+    regardless of which thread they run on, so a shop never sees a burst
+    that triggers 429/503 throttling (and the retries that follow).
+    """
+
+    def __init__(self, min_interval=0.2):  # ~5 req/s per host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_host_throttle = _PerHostThrottle()
+
+
+class _ThrottledSession(requests.Session):
+    """requests.Session that rate-limits per host at the send() layer."""
+
+    def send(self, request, **kwargs):
+        host = urllib.parse.urlsplit(request.url).hostname
+        if host:
+            _host_throttle.wait(host)
+        return super().send(request, **kwargs)
+
+
 def create_session():
-    # Create a requests session with connection pooling and retry logic
-    session = requests.Session()
+    # Create a requests session with connection pooling and retry logic;
+    # every request through it passes the per-host rate gate above
+    session = _ThrottledSession()
     adapter = requests.adapters.HTTPAdapter(
         pool_connections=10,
         pool_maxsize=20,
@@ -121,9 +196,16 @@ def normalize_price(text):
         return "Out of Stock"
 
 
+# Pagination and search-related query parameters stripped from product URLs
+_URL_PARAMS_TO_REMOVE = frozenset(['page', 'search', 'q', 'keyword', 'sort', 'order', 'limit'])
+
+
+@lru_cache(maxsize=65536)
 def normalize_product_url(url):
     """
     Normalize product URL by removing pagination and search query parameters.
+    Memoized: the same product URL recurs across pages and successive runs,
+    so repeat calls are a dict hit instead of a urllib parse/rebuild.
     This prevents duplicate products from being created when the same product
     appears on different search result pages.
     
@@ -138,11 +220,9 @@ def normalize_product_url(url):
         parsed = urllib.parse.urlparse(url)
         query_params = urllib.parse.parse_qs(parsed.query)
         
-        # Remove pagination and search-related query parameters
-        params_to_remove = ['page', 'search', 'q', 'keyword', 'sort', 'order', 'limit']
         filtered_params = {
-            k: v for k, v in query_params.items() 
-            if k.lower() not in params_to_remove
+            k: v for k, v in query_params.items()
+            if k.lower() not in _URL_PARAMS_TO_REMOVE
         }
         
         # Rebuild the URL without the removed parameters
@@ -472,12 +552,13 @@ def scrape_skyland_catalog(category, max_pages=50):
 
 
 def scrape_pchouse_catalog(category, max_pages=50, realtime=False):
-    """Scrape all pages from PcHouse for a category"""
-    is_cloud = bool(os.getenv('RENDER') or os.getenv('DYNO'))
-    if is_cloud:
-        logger.info("PcHouse: Cloud environment detected, using Playwright fallback")
-        return asyncio.run(_scrape_pchouse_with_playwright(category, max_pages, realtime=realtime))
+    """Scrape all pages from PcHouse for a category.
 
+    PcHouse pages render fine without JavaScript, so the pooled-session
+    HTTP path is used everywhere (including cloud) - it's orders of
+    magnitude lighter than launching Chromium. Playwright is kept only
+    as the fallback when the site answers 403 (Cloudflare).
+    """
     session = create_session()
     try:
         base_url = "https://www.pchouse.com.bd/product/search"
@@ -565,12 +646,7 @@ async def _scrape_pchouse_with_playwright(category, max_pages=50, realtime=False
         async with async_playwright() as p:
             browser = await p.chromium.launch(
                 headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                ]
+                args=_chromium_launch_args()
             )
             context = await browser.new_context(
                 viewport={'width': 1600, 'height': 900},
@@ -584,6 +660,7 @@ async def _scrape_pchouse_with_playwright(category, max_pages=50, realtime=False
                     'Upgrade-Insecure-Requests': '1',
                 }
             )
+            await _block_heavy_resources(context)
             page = await context.new_page()
 
             for page_num in range(1, max_pages + 1):
@@ -818,6 +895,39 @@ def scrape_ryans_catalog(category, max_pages=50):
         return _scrape_ryans_with_cloudscraper(category, max_pages)
 
 
+def scrape_ryans_catalog_batch(categories, max_pages=50):
+    """Scrape several Ryans categories, sharing one browser on cloud hosting.
+
+    Per-category scrape_ryans_catalog calls relaunch Chromium every time
+    on cloud; this batches them into a single Playwright session. Locally
+    cloudscraper has no startup cost, so it just loops. Returns a dict
+    keyed by category.
+    """
+    import os
+
+    IS_CLOUD = (
+        os.getenv('RENDER') or
+        os.getenv('DYNO')  # Heroku
+    )
+
+    if IS_CLOUD:
+        logger.info(f"Ryans: Cloud environment detected, scraping {len(categories)} categories in one browser")
+        try:
+            return asyncio.run(_scrape_ryans_categories_with_playwright(categories, max_pages))
+        except Exception as e:
+            logger.error(f"Ryans: Playwright error: {e}")
+            return {
+                category: {"products": [], "logo": "https://www.ryans.com/assets/images/ryans-logo.svg"}
+                for category in categories
+            }
+
+    logger.info(f"Ryans: Local environment detected, using cloudscraper")
+    return {
+        category: _scrape_ryans_with_cloudscraper(category, max_pages)
+        for category in categories
+    }
+
+
 def _scrape_ryans_with_cloudscraper(category, max_pages=50):
     """Scrape Ryans using cloudscraper (for local use)"""
 
@@ -982,28 +1092,38 @@ async def _scrape_ryans_with_playwright(category, max_pages=50):
     Used on cloud hosting for better Cloudflare bypass.
     Now with playwright-stealth for maximum evasion!
     """
+    results = await _scrape_ryans_categories_with_playwright([category], max_pages)
+    return results[category]
+
+
+async def _scrape_ryans_categories_with_playwright(categories, max_pages=50):
+    """Scrape several Ryans categories through one shared browser.
+
+    Chromium startup costs 1-2s per launch, so the browser, context, page
+    and stealth setup are created once and every category reuses them.
+    Returns a dict keyed by category.
+    """
+    empty = {"products": [], "logo": "https://www.ryans.com/assets/images/ryans-logo.svg"}
+
     try:
         from playwright.async_api import async_playwright
         from playwright_stealth import stealth_async
     except ImportError as e:
         logger.error(f"Ryans: Required library not installed: {e}")
         logger.error("Install with: pip install playwright playwright-stealth && playwright install chromium")
-        return {"products": [], "logo": "https://www.ryans.com/assets/images/ryans-logo.svg"}
+        return {category: dict(empty) for category in categories}
 
+    results = {category: dict(empty) for category in categories}
     try:
         async with async_playwright() as p:
             # Launch browser with stealth flags
             browser = await p.chromium.launch(
                 headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
+                args=_chromium_launch_args([
                     '--disable-web-security',
                     '--disable-features=IsolateOrigins,site-per-process',
                     '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                ]
+                ])
             )
 
             # Create context with realistic settings and extra headers
@@ -1024,6 +1144,7 @@ async def _scrape_ryans_with_playwright(category, max_pages=50):
                     'Upgrade-Insecure-Requests': '1',
                 }
             )
+            await _block_heavy_resources(context)
 
             page = await context.new_page()
 
@@ -1045,18 +1166,23 @@ async def _scrape_ryans_with_playwright(category, max_pages=50):
                 window.chrome = { runtime: {} };
             """)
 
-            # Call the existing Playwright scraper
-            result = await scrape_ryans_playwright(page, category, max_pages)
+            # Run every category over the same page; one category failing
+            # shouldn't cost the rest their (already-launched) browser
+            for category in categories:
+                try:
+                    results[category] = await scrape_ryans_playwright(page, category, max_pages)
+                except Exception as e:
+                    logger.error(f"Ryans (Playwright) error for {category}: {e}", exc_info=True)
 
             # Cleanup
             await context.close()
             await browser.close()
 
-            return result
+            return results
 
     except Exception as e:
         logger.error(f"Ryans (Playwright wrapper) error: {e}", exc_info=True)
-        return {"products": [], "logo": "https://www.ryans.com/assets/images/ryans-logo.svg"}
+        return results
 
 
 def scrape_computervillage_catalog(category, max_pages=50):
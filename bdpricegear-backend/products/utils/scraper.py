@@ -287,7 +287,9 @@ async def scrape_binary_playwright(product, context):
     results = {"products": [], "logo": "https://www.binarylogic.com.bd/images/brand_image/binary-logic.webp"}
     try:
         url = f"https://www.binarylogic.com.bd/search/{urllib.parse.quote(product)}"
-        page = await context.new_page()
+        # Reuse the context's live page when there is one - new_page() costs a
+        # V8 isolate init plus an IPC roundtrip per scrape
+        page = context.pages[0] if context.pages else await context.new_page()
         await page.goto(url, timeout=12000, wait_until="domcontentloaded")
         await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
         await asyncio.sleep(1)
@@ -309,7 +311,9 @@ async def scrape_binary_playwright(product, context):
                 "in_stock": True
             })
 
-        await page.close()
+        # Park on about:blank instead of closing so the next scrape on this
+        # context skips page instantiation entirely
+        await page.goto("about:blank")
         return results
     except Exception as e:
         logger.error(f"Binary Playwright error: {e}")
@@ -7,13 +7,14 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.conf import settings
 from django.core.cache import cache
 import hashlib
 import uuid
 
-from .utils.cache_manager import price_cache
+from .utils.cache_manager import cache_get, cache_set, cache_clear_expired
 from .utils.scraper import (
     scrape_startech, scrape_skyland,
     scrape_ultratech,
@@ -36,7 +37,6 @@ import logging
 import time
 import os
 import threading
-from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger("products.views")
 
@@ -174,27 +174,27 @@ def price_comparison(request):
         return Response({"error": "Missing 'product' query parameter"}, status=400)
     
     # Check cache first
-    cached_result = price_cache.get(product)
+    cached_result = cache_get(product)
     if cached_result:
         logger.info(f"Cache hit for '{product}'")
         return Response(cached_result)
     
     # Clean up expired cache 
-    price_cache.clear_expired()
+    cache_clear_expired()
     
+    # asyncio.to_thread runs each sync scraper on the loop's default pool,
+    # so no ThreadPoolExecutor is constructed and torn down per request
     async def gather_all_scrapers(product):
-        with ThreadPoolExecutor() as executor:
-            tasks = [
-                executor.submit(scrape_startech, product),
-                # executor.submit(scrape_ryans, product),  # Disabled for realtime scraping
-                executor.submit(scrape_skyland, product),
-                executor.submit(scrape_ultratech, product),
-                executor.submit(scrape_computervillage, product),
-                executor.submit(scrape_smartbd, product),
-                executor.submit(scrape_selltech, product),
-                executor.submit(scrape_globalbrand, product),
-            ]
-            return [task.result() for task in tasks]
+        return await asyncio.gather(
+            asyncio.to_thread(scrape_startech, product),
+            # asyncio.to_thread(scrape_ryans, product),  # Disabled for realtime scraping
+            asyncio.to_thread(scrape_skyland, product),
+            asyncio.to_thread(scrape_ultratech, product),
+            asyncio.to_thread(scrape_computervillage, product),
+            asyncio.to_thread(scrape_smartbd, product),
+            asyncio.to_thread(scrape_selltech, product),
+            asyncio.to_thread(scrape_globalbrand, product),
+        )
 
     (
         startech,
@@ -223,7 +223,7 @@ def price_comparison(request):
     shops_with_results = [shop for shop in all_shops if shop.get("products")]
     
     # Cache the results: 5 min
-    price_cache.set(product, shops_with_results, ttl=300)
+    cache_set(product, shops_with_results, ttl=300)
     logger.info(f"Cached results for '{product}' - Found {len(shops_with_results)} shops")
     
     return Response(shops_with_results)
@@ -251,9 +251,11 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     # - ?product=<name> (search for specific product by name)
     
     queryset = Product.objects.all().select_related('category', 'shop')
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # No SearchFilter here: ?search= is handled by ProductFilter.filter_search
+    # (full-text on PostgreSQL). Keeping both would AND the FTS predicate with
+    # the old icontains pair and run the ILIKE scans anyway.
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = ProductFilter
-    search_fields = ['name', 'description']
     ordering_fields = ['current_price', 'created_at', 'discount_percentage', 'name']
     ordering = ['-created_at']
     
@@ -315,7 +317,11 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     # List: GET /api/categories/
     # Detail: GET /api/categories/{id}/
     # 
-    queryset = Category.objects.filter(is_active=True)
+    # product_count annotated here so the listing is one GROUP BY query
+    # instead of a COUNT per category
+    queryset = Category.objects.filter(is_active=True).annotate(
+        product_count=Count('products')
+    )
     serializer_class = CategorySerializer
     lookup_field = 'slug'
 
@@ -327,7 +333,9 @@ class ShopViewSet(viewsets.ReadOnlyModelViewSet):
     # List: GET /api/shops/
     # Detail: GET /api/shops/{id}/
     
-    queryset = Shop.objects.filter(is_active=True)
+    queryset = Shop.objects.filter(is_active=True).annotate(
+        product_count=Count('products')
+    )
     serializer_class = ShopSerializer
     lookup_field = 'slug'
 
@@ -511,10 +519,22 @@ def health_check(request):
         # Check database and get last update time
         from django.db import OperationalError
         with connection.cursor() as cursor:
-            # Count all products (including unavailable)
-            cursor.execute("SELECT COUNT(*) FROM products_product")
-            product_count = cursor.fetchone()[0]
-            
+            # Count all products (including unavailable). On PostgreSQL use
+            # the planner's estimate - one pg_class row instead of a full
+            # table scan on every monitoring poll. reltuples is -1 until
+            # the table's first vacuum/analyze, so fall back to COUNT(*).
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE relname = 'products_product'"
+                )
+                row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    product_count = row[0]
+            if not product_count:
+                cursor.execute("SELECT COUNT(*) FROM products_product")
+                product_count = cursor.fetchone()[0]
+
             # Get the most recent updated_at timestamp
             cursor.execute("SELECT MAX(updated_at) FROM products_product")
             last_updated = cursor.fetchone()[0]